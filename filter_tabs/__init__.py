@@ -11,6 +11,7 @@ __version__ = "1.4.3"
 
 from .admonitions import setup_collapsible_admonitions
 from .assets import register_static_assets, write_theme_css
+from .config import init_filter_tabs_config
 from .directives import FilterTabsDirective, TabDirective
 from .nodes import (
     DetailsNode,
@@ -35,7 +36,12 @@ from .render_html import (
     visit_filter_tabs_node,
     visit_summary_node,
 )
-from .transforms import process_filter_tabs_nodes
+from .transforms import (
+    init_filter_tabs_registry,
+    merge_filter_tabs_docs,
+    process_filter_tabs_nodes,
+    purge_filter_tabs_doc,
+)
 
 __all__ = ["setup", "__version__"]
 
@@ -99,13 +105,20 @@ def setup(app: Sphinx) -> ExtensionMetadata:
     app.add_directive("filter-tabs", FilterTabsDirective)
     app.add_directive("tab", TabDirective)
 
+    app.connect("config-inited", init_filter_tabs_config)
     app.connect("builder-inited", register_static_assets)
+    app.connect("env-before-read-docs", init_filter_tabs_registry)
+    app.connect("env-purge-doc", purge_filter_tabs_doc)
+    app.connect("env-merge-info", merge_filter_tabs_docs)
     app.connect("doctree-resolved", process_filter_tabs_nodes)
     app.connect("doctree-resolved", setup_collapsible_admonitions)
     app.connect("build-finished", write_theme_css)
 
     return {
         "version": __version__,
+        # Bump when the data stored on the build environment or on pickled
+        # nodes changes shape.
+        "env_version": 2,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
@@ -48,9 +48,8 @@ def setup_collapsible_admonitions(app: Sphinx, doctree: nodes.document, docname:
         content_node = nodes.container(classes=[COLLAPSIBLE_CONTENT])
         # Move children instead of deepcopying them so reference identities
         # (and nested title nodes) aren't lost/duplicated for other transforms.
-        for child in list(node.children):
-            node.remove(child)
-            content_node += child
+        # extend() re-parents each child; the old admonition is discarded below.
+        content_node.extend(node.children)
 
         details_node += content_node
 
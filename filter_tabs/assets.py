@@ -11,6 +11,24 @@ from .config import _SFT_HARD_CAP
 
 logger = logging.getLogger(__name__)
 
+# Characters allowed in filter_tabs_highlight_color (hex, rgb()/hsl(), names).
+_SAFE_COLOR = re.compile(r"^#?[a-zA-Z0-9\s,().%]+$")
+
+_PANEL_SELECTOR = (
+    '.sft-radio-group input[type="radio"][data-tab-index="{i}"]'
+    ':checked ~ .sft-content > .sft-panel[data-tab-index="{i}"]'
+)
+
+# The visibility rules only depend on the hard cap, so they are built once.
+_VISIBILITY_BLOCK = (
+    "/* Panel visibility — generated at build time, scoped with child\n"
+    " * combinator (>) to isolate nested tab groups. */\n"
+    + ",\n".join(_PANEL_SELECTOR.format(i=i) for i in range(_SFT_HARD_CAP))
+    + " {\n"
+    "    display: block;\n"
+    "}\n"
+)
+
 
 def register_static_assets(app: Sphinx) -> None:
     """Register CSS filenames with Sphinx during builder-inited."""
@@ -35,24 +53,9 @@ def write_theme_css(app: Sphinx, exception: Exception | None) -> None:
     if app.builder.format != "html":
         return
 
-    def _selector(i: int) -> str:
-        return (
-            f'.sft-radio-group input[type="radio"][data-tab-index="{i}"]'
-            f':checked ~ .sft-content > .sft-panel[data-tab-index="{i}"]'
-        )
-
-    selectors = ",\n".join(_selector(i) for i in range(_SFT_HARD_CAP))
-    visibility_block = (
-        "/* Panel visibility — generated at build time, scoped with child\n"
-        " * combinator (>) to isolate nested tab groups. */\n"
-        f"{selectors} {{\n"
-        "    display: block;\n"
-        "}\n"
-    )
-
     color = app.config.filter_tabs_highlight_color
     # Basic CSS color validation to prevent injection
-    if not re.match(r"^#?[a-zA-Z0-9\s,().%]+$", color) or ";" in color or "}" in color:
+    if not _SAFE_COLOR.match(color) or ";" in color or "}" in color:
         logger.warning(
             _(
                 "filter-tabs: invalid highlight color '{color}'. "
@@ -65,9 +68,12 @@ def write_theme_css(app: Sphinx, exception: Exception | None) -> None:
         "/* sphinx-filter-tabs: generated theme — do not edit by hand */\n"
         f":root {{ --sft-highlight-color: {color}; }}\n"
         "\n"
-        f"{visibility_block}"
+        f"{_VISIBILITY_BLOCK}"
     )
     static_dest = Path(app.outdir) / "_static"
-    static_dest.mkdir(parents=True, exist_ok=True)
     theme_file = static_dest / "filter_tabs_theme.css"
+    # Leave an identical file untouched so incremental builds keep its mtime.
+    if theme_file.is_file() and theme_file.read_text(encoding="utf-8") == theme_css:
+        return
+    static_dest.mkdir(parents=True, exist_ok=True)
     theme_file.write_text(theme_css, encoding="utf-8")
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from weakref import WeakKeyDictionary
 
+from sphinx.application import Sphinx
 from sphinx.config import Config
 
 _SFT_WARN_THRESHOLD = 15
 _SFT_HARD_CAP = 20
 
 
-@dataclass
+@dataclass(frozen=True)
 class FilterTabsConfig:
     """Simplified configuration settings for filter-tabs rendering."""
 
@@ -21,3 +23,17 @@ class FilterTabsConfig:
             highlight_color=getattr(app_config, "filter_tabs_highlight_color", cls.highlight_color),
             debug_mode=getattr(app_config, "filter_tabs_debug_mode", cls.debug_mode),
         )
+
+    @classmethod
+    def for_app(cls, app: Sphinx) -> FilterTabsConfig:
+        """Return the settings stored for *app* by ``init_filter_tabs_config``."""
+        return _APP_CONFIGS[app]
+
+
+# One entry per Sphinx application, dropped when the application is collected.
+_APP_CONFIGS: WeakKeyDictionary[Sphinx, FilterTabsConfig] = WeakKeyDictionary()
+
+
+def init_filter_tabs_config(app: Sphinx, config: Config) -> None:
+    """Read the filter-tabs settings once per application. Connected to ``config-inited``."""
+    _APP_CONFIGS[app] = FilterTabsConfig.from_sphinx_config(config)
@@ -7,9 +7,12 @@ from docutils.parsers.rst import Directive, directives
 from sphinx.util import logging
 
 from .nodes import FilterTabSlotNode, FilterTabsNode
+from .utils import default_legend
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_MARKER = re.compile(r"^(.*?)\s*\(\s*default\s*\)$", re.IGNORECASE)
+
 
 class TabDirective(Directive):
     """Handles the ``.. tab::`` directive, capturing its content and options."""
@@ -32,6 +35,8 @@ class TabDirective(Directive):
             raise self.error(f"Invalid tab argument: {e}") from e
 
         slot = FilterTabSlotNode()
+        # Lets warnings about this tab point at its own line.
+        slot.source, slot.line = self.state_machine.get_source_and_line(self.lineno)
         slot["tab_name"] = tab_name
         slot["is_default"] = is_default
         slot["aria_label"] = self.options.get("aria-label", None)
@@ -45,7 +50,12 @@ class TabDirective(Directive):
             raise ValueError("Tab argument cannot be empty")
 
         first_line = argument.strip().split("\n")[0].strip()
-        match = re.match(r"^(.*?)\s*\(\s*default\s*\)$", first_line, re.IGNORECASE)
+        # Most tab names carry no marker; skip the regex unless one could be present.
+        # The marker is anchored at the end, so a cheap suffix test comes first.
+        if not first_line.endswith(")") or "default" not in first_line.lower():
+            return first_line, False
+
+        match = _DEFAULT_MARKER.match(first_line)
         if match:
             tab_name = match.group(1).strip()
             if not tab_name:
@@ -73,10 +83,8 @@ class FilterTabsDirective(Directive):
     def run(self) -> list[nodes.Node]:
         env = self.state.document.settings.env
 
-        if not hasattr(env, "sft_context") or not isinstance(env.sft_context, int):
-            env.sft_context = 0
-
-        env.sft_context += 1
+        sft_context = getattr(env, "sft_context", 0)
+        env.sft_context = (sft_context if isinstance(sft_context, int) else 0) + 1
         try:
             # Parse content into a temporary container; TabDirective will produce
             # FilterTabSlotNode instances and everything else is general content.
@@ -99,36 +107,51 @@ class FilterTabsDirective(Directive):
                 msg += " Some content was found, but it was not part of a `.. tab::` block."
             raise self.error(msg)
 
-        self._validate_slots(slots)
-
-        if not any(s["is_default"] for s in slots):
-            slots[0]["is_default"] = True
+        default_index = self._validate_slots(slots)
 
         ft_node = FilterTabsNode()
-        ft_node["custom_legend"] = self.options.get("legend")
+        # Let process_filter_tabs_nodes skip documents without any tab groups.
+        docs_with_tabs = getattr(env, "filter_tabs_docs", None)
+        if docs_with_tabs is not None:
+            docs_with_tabs.add(env.docname)
+
+        # Resolved here so the text is stored with the pickled doctree and
+        # is not recomputed each time the page is written.
+        ft_node["legend_text"] = self.options.get("legend") or default_legend(
+            [s["tab_name"] for s in slots]
+        )
+        ft_node["default_index"] = default_index
 
         # Add general content first, then tab slots — all as real children.
-        for child in general_content:
-            ft_node += child
-        for slot in slots:
-            ft_node += slot
+        ft_node.extend(general_content)
+        ft_node.extend(slots)
 
         return [ft_node]
 
-    def _validate_slots(self, slots: list[FilterTabSlotNode]) -> None:
-        names: list[str] = []
-        for slot in slots:
+    def _validate_slots(self, slots: list[FilterTabSlotNode]) -> int:
+        """Check tab names and defaults; return the index of the tab selected first.
+
+        That is the first tab marked default, or the first tab if none is.
+        """
+        seen: set[str] = set()
+        default_indices: list[int] = []
+        for i, slot in enumerate(slots):
             name = slot["tab_name"]
-            if name in names:
+            if name in seen:
                 raise self.error(f"Duplicate tab name '{name}'. Each tab must have a unique name.")
-            names.append(name)
+            seen.add(name)
             if not slot.children:
-                logger.warning(f"Tab '{name}' has no content.")
-
-        defaults = [s for s in slots if s["is_default"]]
-        if len(defaults) > 1:
-            default_names = [s["tab_name"] for s in defaults]
+                logger.warning(f"Tab '{name}' has no content.", location=slot)
+            if slot["is_default"]:
+                default_indices.append(i)
+
+        if not default_indices:
+            return 0
+        if len(default_indices) > 1:
+            default_names = [slots[i]["tab_name"] for i in default_indices]
             logger.warning(
                 f"Multiple tabs marked as default: {', '.join(default_names)}. "
-                f"Using first default: '{default_names[0]}'"
+                f"Using first default: '{default_names[0]}'",
+                location=slots[default_indices[1]],
             )
+        return default_indices[0]
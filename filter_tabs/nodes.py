@@ -7,7 +7,8 @@ class FilterTabsNode(nodes.General, nodes.Element):
     """The main container for a set of filter tabs.
 
     In the intermediate doctree (at parse time), this node contains children
-    rendered as ``FilterTabSlotNode`` and any general content.
+    rendered as ``FilterTabSlotNode`` and any general content, and carries the
+    resolved ``legend_text`` and ``default_index`` (the tab selected first).
 
     In the resolved doctree (after ``process_filter_tabs_nodes``), this node
     becomes the final semantic container, holding children of type
@@ -22,7 +23,7 @@ class FilterTabSlotNode(nodes.General, nodes.Element):
 
     Attributes:
     - ``tab_name``   – display name of the tab
-    - ``is_default`` – whether this tab is initially selected
+    - ``is_default`` – whether this tab is marked ``(default)`` in the source
     - ``aria_label`` – optional ARIA label override
     """
 
@@ -38,6 +39,7 @@ class FilterTabNode(nodes.General, nodes.Element):
     - ``aria_label``
     - ``radio_id``
     - ``desc_id``
+    - ``desc_text`` (translated screen-reader description)
     - ``panel_id``
     - ``tab_index``
     - ``group_id``
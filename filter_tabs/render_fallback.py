@@ -9,13 +9,16 @@ def render_fallback(
     slots: list[FilterTabSlotNode],
     general_content: list[nodes.Node],
 ) -> list[nodes.Node]:
-    """Produce plain admonition nodes for LaTeX and other non-HTML builders."""
+    """Produce plain admonition nodes for LaTeX and other non-HTML builders.
+
+    As with ``render_html``, content is moved out of the slots rather than copied.
+    """
     output: list[nodes.Node] = []
     if general_content:
-        output.extend(c.deepcopy() for c in general_content)
+        output.extend(general_content)
     for slot in slots:
         admonition = nodes.admonition()
         admonition += nodes.title(text=slot["tab_name"])
-        admonition.extend(c.deepcopy() for c in slot.children)
+        admonition.extend(slot.children)
         output.append(admonition)
     return output
@@ -7,7 +7,7 @@ from sphinx.locale import _
 from sphinx.util import logging
 from sphinx.writers.html import HTML5Translator
 
-from .config import _SFT_HARD_CAP, _SFT_WARN_THRESHOLD, FilterTabsConfig
+from .config import _SFT_HARD_CAP, _SFT_WARN_THRESHOLD
 from .nodes import (
     DetailsNode,
     FilterTabNode,
@@ -17,37 +17,57 @@ from .nodes import (
     FilterTabsNode,
     SummaryNode,
 )
-from .utils import IDGenerator, infer_content_type
+from .utils import IDGenerator
 
 logger = logging.getLogger(__name__)
 
+# Node attributes that are handled by starttag() itself or only used internally.
+_INTERNAL_ATTR_KEYS = frozenset(
+    {
+        "ids",
+        "classes",
+        "names",
+        "dupnames",
+        "backrefs",
+        "legend_text",
+        "legend_id",
+        "group_id",
+        "radio_id",
+        "desc_id",
+        "desc_text",
+        "panel_id",
+        "tab_index",
+        "tab_name",
+        "is_default",
+        "aria_label",
+    }
+)
+
+# Static attributes shared by every tab panel (scalar values only).
+_TAB_PANEL_ATTRS = {"role": "tabpanel", "tabindex": "0"}
+
 
 def render_html(
     slots: list[FilterTabSlotNode],
     general_content: list[nodes.Node],
-    custom_legend: str | None,
+    legend_text: str,
+    default_index: int,
     id_gen: IDGenerator,
-    config: FilterTabsConfig,
-    env: Any,
 ) -> list[nodes.Node]:
-    """Produce semantic FilterTabsNode structure."""
+    """Produce semantic FilterTabsNode structure.
+
+    Tab and general content is moved, not copied, into the new panels: the
+    source ``FilterTabsNode`` is discarded by the caller once this returns.
+    """
     container = FilterTabsNode(
         classes=["sft-container"],
         role="region",
     )
-    container["aria-labelledby"] = id_gen.legend_id()
+    legend_id = id_gen.legend_id()
+    container["aria-labelledby"] = legend_id
     container["group_id"] = id_gen.group_id
-    container["legend_id"] = id_gen.legend_id()
-
-    # Resolve legend text
-    if custom_legend:
-        container["legend_text"] = custom_legend
-    else:
-        tab_names = [s["tab_name"] for s in slots]
-        content_type = infer_content_type(tab_names)
-        container["legend_text"] = _("Choose {content_type}: {tab_names}").format(
-            content_type=content_type, tab_names=", ".join(tab_names)
-        )
+    container["legend_id"] = legend_id
+    container["legend_text"] = legend_text
 
     # Logging and Capping Logic
     n = len(slots)
@@ -67,21 +87,42 @@ def render_html(
             ).format(n=n)
         )
 
-    default_index = next((i for i, s in enumerate(slots) if s["is_default"]), 0)
+    # Looked up once per group rather than once per tab at write time.
+    select_template = _("Select {tab_name} tab")
 
-    # Add tab marker nodes (radio + label info)
+    # Build tab markers and their panels in one pass.
+    markers: list[FilterTabNode] = []
+    panels: list[FilterTabPanelNode] = []
     for i, slot in enumerate(slots):
-        tab_node = FilterTabNode(
-            tab_name=slot["tab_name"],
-            is_default=(i == default_index),
-            aria_label=slot.get("aria_label"),
-            radio_id=id_gen.radio_id(i),
-            desc_id=id_gen.desc_id(i),
-            panel_id=id_gen.panel_id(i),
-            tab_index=str(i),
-            group_id=id_gen.group_id,
-        )
-        container += tab_node
+        tab_name = slot["tab_name"]
+        radio_id = id_gen.radio_id(i)
+        panel_id = id_gen.panel_id(i)
+        tab_index = str(i)
+
+        # Attributes are assigned directly; Element.__init__ would normalise
+        # each keyword argument first.
+        marker = FilterTabNode()
+        marker["tab_name"] = tab_name
+        marker["is_default"] = i == default_index
+        marker["aria_label"] = slot.get("aria_label")
+        marker["radio_id"] = radio_id
+        marker["desc_id"] = id_gen.desc_id(i)
+        marker["desc_text"] = select_template.format(tab_name=tab_name)
+        marker["panel_id"] = panel_id
+        marker["tab_index"] = tab_index
+        marker["group_id"] = id_gen.group_id
+        markers.append(marker)
+
+        # classes/ids stay in the constructor so every panel gets its own lists.
+        panel = FilterTabPanelNode(classes=["sft-panel"], ids=[panel_id])
+        panel.attributes.update(_TAB_PANEL_ATTRS)
+        panel["data-tab"] = tab_name.lower().replace(" ", "-")
+        panel["data-tab-index"] = tab_index
+        panel["aria-labelledby"] = radio_id
+        panel.extend(slot.children)
+        panels.append(panel)
+
+    container.extend(markers)
 
     # Add content container
     content_area = FilterTabsContentNode(classes=["sft-content"])
@@ -95,22 +136,11 @@ def render_html(
         )
         general_panel["data-filter"] = "General"
         general_panel["aria-label"] = _("General information")
-        general_panel.extend(c.deepcopy() for c in general_content)
+        general_panel.extend(general_content)
         content_area += general_panel
 
     # Add tab panels
-    for i, slot in enumerate(slots):
-        panel = FilterTabPanelNode(
-            classes=["sft-panel"],
-            ids=[id_gen.panel_id(i)],
-            role="tabpanel",
-            tabindex="0",
-        )
-        panel["data-tab"] = slot["tab_name"].lower().replace(" ", "-")
-        panel["data-tab-index"] = str(i)
-        panel["aria-labelledby"] = id_gen.radio_id(i)
-        panel.extend(c.deepcopy() for c in slot.children)
-        content_area += panel
+    content_area.extend(panels)
 
     return [container]
 
@@ -120,49 +150,23 @@ def render_html(
 # =============================================================================
 
 
-def _get_starttag_attrs(node: nodes.Element, exclude_keys: tuple[str, ...] = ()) -> dict[str, Any]:
+def _get_starttag_attrs(node: nodes.Element) -> dict[str, Any]:
     """Helper to extract attributes suitable for self.starttag() kwargs."""
-    attrs = {}
-    internal_keys = {
-        "ids",
-        "classes",
-        "names",
-        "dupnames",
-        "backrefs",
-        "legend_text",
-        "legend_id",
-        "group_id",
-        "radio_id",
-        "desc_id",
-        "panel_id",
-        "tab_index",
-        "tab_name",
-        "is_default",
-        "aria_label",
-    }
-    for key, value in node.attributes.items():
-        if key not in internal_keys and key not in exclude_keys:
-            attrs[key] = value
-    return attrs
+    return {k: v for k, v in node.attributes.items() if k not in _INTERNAL_ATTR_KEYS}
 
 
 def visit_filter_tabs_node(self: HTML5Translator, node: FilterTabsNode) -> None:
     # Outer container (div)
     self.body.append(self.starttag(node, "div", **_get_starttag_attrs(node)))
 
-    # Fieldset
-    fieldset_proxy = nodes.Element(classes=["sft-fieldset"])
-    self.body.append(self.starttag(fieldset_proxy, "fieldset", role="radiogroup"))
-
-    # Legend
-    legend_proxy = nodes.Element(classes=["sft-legend"], ids=[node["legend_id"]])
-    self.body.append(self.starttag(legend_proxy, "legend"))
-    self.body.append(self.encode(node["legend_text"]))
-    self.body.append("</legend>")
-
-    # Radio Group Container
-    radio_group_proxy = nodes.Element(classes=["sft-radio-group"])
-    self.body.append(self.starttag(radio_group_proxy, "div"))
+    # Fieldset, legend and radio group container. Their attributes are fixed,
+    # so the tags are written directly (attributes in starttag()'s sorted order).
+    self.body.append(
+        '<fieldset class="sft-fieldset" role="radiogroup">\n'
+        f'<legend class="sft-legend" id="{self.attval(node["legend_id"])}">\n'
+        f"{self.encode(node['legend_text'])}</legend>"
+        '<div class="sft-radio-group">\n'
+    )
 
 
 def depart_filter_tabs_node(self: HTML5Translator, node: FilterTabsNode) -> None:
@@ -171,30 +175,29 @@ def depart_filter_tabs_node(self: HTML5Translator, node: FilterTabsNode) -> None
 
 def visit_filter_tab_node(self: HTML5Translator, node: FilterTabNode) -> None:
     """Render the hidden radio input and its visible label."""
-    # Radio Input
-    radio_proxy = nodes.Element(classes=["sr-only"], ids=[node["radio_id"]])
-    radio_attrs = {
-        "type": "radio",
-        "name": node["group_id"],
-        "aria-describedby": node["desc_id"],
-        "aria-controls": node["panel_id"],
-        "data-tab-index": node["tab_index"],
-    }
-    if node.get("aria_label"):
-        radio_attrs["aria-label"] = node["aria_label"]
-    if node["is_default"]:
-        radio_attrs["checked"] = "checked"
+    radio_id = self.attval(node["radio_id"])
+    desc_id = self.attval(node["desc_id"])
+    aria_label = node.get("aria_label")
+    tab_name = self.encode(node["tab_name"])
+    description = self.encode(node["desc_text"])
 
-    self.body.append(self.starttag(radio_proxy, "input", **radio_attrs))
-
-    # Label
-    self.body.append(f'<label for="{node["radio_id"]}">{self.encode(node["tab_name"])}</label>')
-
-    # Screen Reader Description
+    # Attributes are emitted in the same sorted order starttag() would use.
     self.body.append(
-        f'<div class="sr-only" id="{node["desc_id"]}">'
-        f"{_('Select {tab_name} tab').format(tab_name=self.encode(node['tab_name']))}"
-        "</div>"
+        "".join(
+            (
+                # Radio Input
+                f'<input aria-controls="{self.attval(node["panel_id"])}"'
+                f' aria-describedby="{desc_id}"',
+                f' aria-label="{self.attval(aria_label)}"' if aria_label else "",
+                ' checked="checked"' if node["is_default"] else "",
+                f' class="sr-only" data-tab-index="{self.attval(node["tab_index"])}"'
+                f' id="{radio_id}" name="{self.attval(node["group_id"])}" type="radio">\n',
+                # Label
+                f'<label for="{radio_id}">{tab_name}</label>',
+                # Screen Reader Description
+                f'<div class="sr-only" id="{desc_id}">{description}</div>',
+            )
+        )
     )
 
 
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from docutils import nodes
 from sphinx.application import Sphinx
+from sphinx.builders.html import StandaloneHTMLBuilder
+from sphinx.builders.singlehtml import SingleFileHTMLBuilder
+from sphinx.environment import BuildEnvironment
 from sphinx.util import logging
 
 from .config import FilterTabsConfig
@@ -13,26 +16,78 @@ from .utils import IDGenerator
 logger = logging.getLogger(__name__)
 
 
-def validate_tabs_structure(ft_node: FilterTabsNode) -> bool:
-    """Perform a structural check on a FilterTabsNode before rendering.
+def init_filter_tabs_registry(app: Sphinx, env: BuildEnvironment, docnames: list[str]) -> None:
+    """Ensure ``env.filter_tabs_docs`` exists before any document is read.
 
-    Verifies that the node contains at least one slot and that all slots
-    have a name. Returns True if valid, False otherwise.
+    The set records which documents contain a ``filter-tabs`` directive and
+    is pickled with the environment. Connected to ``env-before-read-docs``.
     """
-    slots = [c for c in ft_node.children if isinstance(c, FilterTabSlotNode)]
+    if not hasattr(env, "filter_tabs_docs"):
+        env.filter_tabs_docs = set()
+
+
+def purge_filter_tabs_doc(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    """Forget a document that is about to be re-read. Connected to ``env-purge-doc``."""
+    docs_with_tabs: set[str] | None = getattr(env, "filter_tabs_docs", None)
+    if docs_with_tabs is not None:
+        docs_with_tabs.discard(docname)
 
-    if not slots:
-        logger.error(f"filter-tabs: {ft_node.source}:{ft_node.line}: Missing tab slots.")
-        return False
 
-    for i, slot in enumerate(slots):
-        if not slot.get("tab_name"):
+def merge_filter_tabs_docs(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    """Merge a parallel reader's registry. Connected to ``env-merge-info``."""
+    env.filter_tabs_docs |= getattr(other, "filter_tabs_docs", set()) & docnames
+
+
+def _resolves_one_document_per_call(app: Sphinx) -> bool:
+    """Whether ``doctree-resolved`` receives exactly the document named by ``docname``.
+
+    LaTeX, Texinfo, man and single-page HTML builders resolve one assembled tree
+    (named after the root document) that inlines every included document. The
+    check is by class, not name, because PDF-via-HTML builders subclass the
+    single-page builder under names of their own.
+    """
+    return isinstance(app.builder, StandaloneHTMLBuilder) and not isinstance(
+        app.builder, SingleFileHTMLBuilder
+    )
+
+
+def split_tabs_children(
+    ft_node: FilterTabsNode,
+) -> tuple[list[FilterTabSlotNode], list[nodes.Node]] | None:
+    """Split a FilterTabsNode's children into tab slots and general content.
+
+    The structural check is done in the same pass: returns None (after logging
+    an error) if there are no slots or a slot is missing its name.
+    """
+    slots: list[FilterTabSlotNode] = []
+    general_content: list[nodes.Node] = []
+    for child in ft_node.children:
+        if not isinstance(child, FilterTabSlotNode):
+            general_content.append(child)
+            continue
+        if not child.get("tab_name"):
             logger.error(
-                f"filter-tabs: {ft_node.source}:{ft_node.line}: Slot {i} missing tab_name."
+                f"filter-tabs: {ft_node.source}:{ft_node.line}: Slot {len(slots)} missing tab_name."
             )
-            return False
+            return None
+        slots.append(child)
+
+    if not slots:
+        logger.error(f"filter-tabs: {ft_node.source}:{ft_node.line}: Missing tab slots.")
+        return None
 
-    return True
+    return slots, general_content
+
+
+def validate_tabs_structure(ft_node: FilterTabsNode) -> bool:
+    """Perform a structural check on a FilterTabsNode before rendering.
+
+    Verifies that the node contains at least one slot and that all slots
+    have a name. Returns True if valid, False otherwise.
+    """
+    return split_tabs_children(ft_node) is not None
 
 
 def process_filter_tabs_nodes(app: Sphinx, doctree: nodes.document, docname: str) -> None:
@@ -40,28 +95,51 @@ def process_filter_tabs_nodes(app: Sphinx, doctree: nodes.document, docname: str
 
     Connected to the ``doctree-resolved`` event.
     """
-    config = FilterTabsConfig.from_sphinx_config(app.config)
+    # Builders such as dummy, linkcheck and gettext write no rendered
+    # documents, so the intermediate nodes can stay as they are.
+    if not app.builder.format:
+        return
+
+    # Skip the tree walk for documents the directive never ran in. Unknown
+    # environments (no registry) are always processed.
+    docs_with_tabs: set[str] | None = getattr(app.env, "filter_tabs_docs", None)
+    if docs_with_tabs is not None and (
+        not docs_with_tabs
+        or (_resolves_one_document_per_call(app) and docname not in docs_with_tabs)
+    ):
+        return
+
+    ft_nodes = list(doctree.findall(FilterTabsNode))
+    if not ft_nodes:
+        # Most documents have no tab groups; skip the config lookups entirely.
+        return
+
+    config = FilterTabsConfig.for_app(app)
     is_html = app.builder.format == "html"
 
-    # Per-document counter stored on the doctree node itself.
-    doc_counter_key = "_filter_tabs_counter"
-
-    # We iterate in reverse to allow safe nested replacement.
-    for ft_node in reversed(list(doctree.findall(FilterTabsNode))):
-        if not validate_tabs_structure(ft_node):
+    # Every group in the document is replaced in this one pass, so a local
+    # counter numbers them exactly as a counter kept on the doctree would.
+    group_prefix = f"filter-group-{docname.replace('/', '-')}-"
+    counter = 0
+
+    # Inner groups are resolved before the groups that contain them, which keeps
+    # group numbering stable (the innermost group of a nest gets the lowest number).
+    ft_nodes.reverse()
+    for ft_node in ft_nodes:
+        children = split_tabs_children(ft_node)
+        if children is None:
             # If invalid, we just remove it to prevent a crash, but the log
             # already contains the error.
             ft_node.parent.remove(ft_node)
             continue
+        slots, general_content = children
 
-        custom_legend: str | None = ft_node.get("custom_legend")
-
-        slots = [c for c in ft_node.children if isinstance(c, FilterTabSlotNode)]
-        general_content = [c for c in ft_node.children if not isinstance(c, FilterTabSlotNode)]
+        # Resolved by the directive and stored with the pickled doctree.
+        legend_text: str = ft_node["legend_text"]
+        default_index: int = ft_node["default_index"]
 
-        current = doctree.get(doc_counter_key, 0) + 1
-        doctree[doc_counter_key] = current
-        group_id = f"filter-group-{docname.replace('/', '-')}-{current}"
+        counter += 1
+        group_id = group_prefix + str(counter)
         id_gen = IDGenerator(group_id)
 
         if config.debug_mode:
@@ -70,14 +148,7 @@ def process_filter_tabs_nodes(app: Sphinx, doctree: nodes.document, docname: str
             )
 
         if is_html:
-            replacement = render_html(
-                slots,
-                general_content,
-                custom_legend,
-                id_gen,
-                config,
-                app.env,
-            )
+            replacement = render_html(slots, general_content, legend_text, default_index, id_gen)
         else:
             replacement = render_fallback(slots, general_content)
 
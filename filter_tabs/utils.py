@@ -1,56 +1,117 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from functools import lru_cache
 
 from sphinx.locale import _
 
 
-@dataclass
+def N_(message: str) -> str:
+    """Mark ``message`` for gettext extraction without translating it yet."""
+    return message
+
+
 class IDGenerator:
     """Centralized ID generation for consistent element identification."""
 
-    group_id: str
+    __slots__ = ("group_id", "_radio", "_panel", "_desc", "_label", "_legend")
+
+    def __init__(self, group_id: str) -> None:
+        self.group_id = group_id
+        self._radio = f"{group_id}-radio-"
+        self._panel = f"{group_id}-panel-"
+        self._desc = f"{group_id}-desc-"
+        self._label = f"{group_id}-label-"
+        self._legend = f"{group_id}-legend"
+
+    def __repr__(self) -> str:
+        return f"IDGenerator(group_id={self.group_id!r})"
 
     def radio_id(self, index: int) -> str:
-        return f"{self.group_id}-radio-{index}"
+        return self._radio + str(index)
 
     def panel_id(self, index: int) -> str:
-        return f"{self.group_id}-panel-{index}"
+        return self._panel + str(index)
 
     def desc_id(self, index: int) -> str:
-        return f"{self.group_id}-desc-{index}"
+        return self._desc + str(index)
 
     def legend_id(self) -> str:
-        return f"{self.group_id}-legend"
+        return self._legend
 
     def label_id(self, index: int) -> str:
-        return f"{self.group_id}-label-{index}"
+        return self._label + str(index)
+
+
+# Keyword groups in priority order. Content types are only marked for extraction
+# here and passed through ``_()`` on return, so the current build's language is used.
+_PATTERNS: tuple[tuple[frozenset[str], str], ...] = (
+    (
+        frozenset({"python", "javascript", "java", "c++", "rust", "go", "ruby", "php"}),
+        N_("programming language"),
+    ),
+    (
+        frozenset({"windows", "mac", "macos", "linux", "ubuntu", "debian", "fedora"}),
+        N_("operating system"),
+    ),
+    (frozenset({"pip", "conda", "npm", "yarn", "cargo", "gem", "composer"}), N_("package manager")),
+    (frozenset({"cli", "gui", "terminal", "command", "console", "graphical"}), N_("interface")),
+    (frozenset({"development", "staging", "production", "test", "local"}), N_("environment")),
+    (frozenset({"source", "binary", "docker", "manual", "automatic"}), N_("installation method")),
+)
+
+# Keyword -> index into _PATTERNS, for the exact-match pass.
+_KEYWORD_RANK: dict[str, int] = {
+    keyword: rank for rank, (keywords, _type) in enumerate(_PATTERNS) for keyword in keywords
+}
+
+# Every keyword in one pattern for the substring pass, with capture group N
+# holding the keywords of _PATTERNS[N - 1]. The lookahead lets finditer()
+# report a hit at every position, so overlapping keywords are never skipped.
+_SUBSTRING_RE = re.compile(
+    "(?="
+    + "|".join(
+        "(" + "|".join(re.escape(keyword) for keyword in sorted(keywords)) + ")"
+        for keywords, _type in _PATTERNS
+    )
+    + ")"
+)
+
+
+@lru_cache(maxsize=512)
+def _match_content_type(lower_names: frozenset[str]) -> str:
+    """Return the untranslated content type for a set of lower-cased tab names.
+
+    Cached because the same tab sets (e.g. Windows/Mac/Linux) recur across a
+    project. Translation is left to the caller so the cache is language-neutral.
+    """
+    exact_hits = lower_names & _KEYWORD_RANK.keys()
+    if exact_hits:
+        return _PATTERNS[min(_KEYWORD_RANK[name] for name in exact_hits)][1]
+    best: int | None = None
+    for match in _SUBSTRING_RE.finditer("\0".join(lower_names)):
+        group = match.lastindex
+        if group is not None and (best is None or group < best):
+            best = group
+            if best == 1:
+                break
+    if best is not None:
+        return _PATTERNS[best - 1][1]
+    return N_("option")
 
 
 def infer_content_type(tab_names: list[str]) -> str:
     """Infer a meaningful legend from tab names.
 
-    Matching is performed in two passes over the predefined PATTERNS list:
+    Matching is performed in two passes over the predefined patterns:
     1. Exact keyword match (first pattern to match wins)
     2. Substring match (first pattern to match wins)
     """
-    PATTERNS = [
-        (
-            ["python", "javascript", "java", "c++", "rust", "go", "ruby", "php"],
-            _("programming language"),
-        ),
-        (["windows", "mac", "macos", "linux", "ubuntu", "debian", "fedora"], _("operating system")),
-        (["pip", "conda", "npm", "yarn", "cargo", "gem", "composer"], _("package manager")),
-        (["cli", "gui", "terminal", "command", "console", "graphical"], _("interface")),
-        (["development", "staging", "production", "test", "local"], _("environment")),
-        (["source", "binary", "docker", "manual", "automatic"], _("installation method")),
-    ]
-    lower_names = [name.lower() for name in tab_names]
-    for keywords, content_type in PATTERNS:
-        if any(name in keywords for name in lower_names):
-            return content_type
-    for keywords, content_type in PATTERNS:
-        for name in lower_names:
-            if any(keyword in name for keyword in keywords):
-                return content_type
-    return _("option")
+    return _(_match_content_type(frozenset(name.lower() for name in tab_names)))
+
+
+def default_legend(tab_names: list[str]) -> str:
+    """Build the legend used when a ``filter-tabs`` block has no ``:legend:`` option."""
+    return _("Choose {content_type}: {tab_names}").format(
+        content_type=infer_content_type(tab_names), tab_names=", ".join(tab_names)
+    )
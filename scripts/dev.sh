@@ -53,7 +53,8 @@ install_package() {
 # Run tests
 run_tests() {
     print_status "Running tests..."
-    $PYTEST || {
+    # Spread the Sphinx builds over all cores; loadgroup keeps shared builds together.
+    $PYTEST -n auto --dist loadgroup || {
         print_error "Tests failed"
         exit 1
     }
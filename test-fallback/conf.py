@@ -0,0 +1,17 @@
+# test-fallback/conf.py
+
+# One project built by every non-HTML builder in the fallback tests.
+
+extensions = [
+    "filter_tabs",
+]
+
+project = "Sphinx Test Project"
+
+# The man and texinfo settings are ignored by the other builders, so every
+# fallback build shares one configuration and one pickled environment.
+latex_documents = [("index", "testdoc.tex", "Test", "Author", "manual")]
+man_pages = [("index", "testdoc", "Test", ["Author"], 1)]
+texinfo_documents = [
+    ("index", "testdoc", "Test", "Author", "testdoc", "A test.", "Miscellaneous")
+]
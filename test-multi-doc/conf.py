@@ -0,0 +1,16 @@
+# test-multi-doc/conf.py
+
+# A two-document project: only the second page contains filter-tabs.
+
+import sys
+from pathlib import Path
+
+# Makes the local pdflike_builder extension importable.
+sys.path.insert(0, str(Path(__file__).parent))
+
+extensions = [
+    "filter_tabs",
+    "pdflike_builder",
+]
+
+project = "Sphinx Test Project"
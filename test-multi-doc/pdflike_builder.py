@@ -0,0 +1,16 @@
+# test-multi-doc/pdflike_builder.py
+
+# Stands in for a third-party PDF-via-HTML builder: a single-page HTML builder
+# registered under a name of its own.
+
+from sphinx.application import Sphinx
+from sphinx.builders.singlehtml import SingleFileHTMLBuilder
+
+
+class PdfLikeBuilder(SingleFileHTMLBuilder):
+    name = "pdflike"
+
+
+def setup(app: Sphinx) -> dict[str, bool]:
+    app.add_builder(PdfLikeBuilder)
+    return {"parallel_read_safe": True, "parallel_write_safe": True}
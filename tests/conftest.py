@@ -1,6 +1,14 @@
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path  # Use the modern pathlib instead
 
 import pytest
+from bs4 import BeautifulSoup, SoupStrainer
+from sphinx.testing.util import SphinxTestApp
+
+# Import the extension up front: if it is broken, collection stops here with one
+# traceback instead of every Sphinx test failing after its own app startup.
+import filter_tabs  # noqa: F401
 
 # This line activates the sphinx testing plugin
 pytest_plugins = "sphinx.testing.fixtures"
@@ -12,6 +20,95 @@ def rootdir() -> Path:
     return Path(__file__).parent.parent.absolute()
 
 
+@lru_cache(maxsize=64)
+def _parse_html(
+    path: str, mtime_ns: int, size: int, parse_only: SoupStrainer | None
+) -> BeautifulSoup:
+    # Sphinx writes UTF-8; handing lxml the bytes skips a separate decode step.
+    return BeautifulSoup(
+        Path(path).read_bytes(), "lxml", from_encoding="utf-8", parse_only=parse_only
+    )
+
+
+@pytest.fixture(scope="session")
+def parse_html() -> Callable[..., BeautifulSoup]:
+    """Parse a built HTML page with lxml.
+
+    The soup is cached on the file's path, mtime and size, so a page that has
+    not been rebuilt is only parsed once. Treat the returned soup as read-only.
+    Pass a module-level ``SoupStrainer`` as ``parse_only`` to keep just the
+    parts of the page a test inspects; strainers are cached by identity.
+    """
+
+    def parse(path: Path, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        stat = Path(path).stat()
+        return _parse_html(str(path), stat.st_mtime_ns, stat.st_size, parse_only)
+
+    return parse
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Keep tests that share a Sphinx source tree on one pytest-xdist worker.
+
+    Tests with the same ``shared_result`` key or explicit ``srcdir`` reuse each
+    other's build. With ``--dist loadgroup`` this grouping lets every worker
+    build a shared project at most once instead of each worker rebuilding it.
+    Runs first so xdist sees the markers when it assigns the groups.
+    """
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        params = item.get_closest_marker("test_params")
+        sphinx = item.get_closest_marker("sphinx")
+        group = (params.kwargs.get("shared_result") if params else None) or (
+            sphinx.kwargs.get("srcdir") if sphinx else None
+        )
+        if group:
+            item.add_marker(pytest.mark.xdist_group(group))
+
+
 def pytest_addoption(parser):
     """Registers the 'sphinx_srcdir' option for pytest.ini."""
     parser.addini("sphinx_srcdir", "Sphinx source directory for tests", type="string", default=".")
+
+
+@pytest.fixture
+def write_source(app: SphinxTestApp) -> Callable[..., None]:
+    """Write a document into ``app.srcdir``, always refreshing its mtime.
+
+    Tests without an explicit ``srcdir`` share one source tree and doctree
+    cache. Rewriting unconditionally makes Sphinx read and write the document
+    again, so this test's app sees its own warnings even when an earlier test
+    (or a rerun) left identical content behind.
+    """
+
+    def write(content: str, docname: str = "index") -> None:
+        app.srcdir.joinpath(f"{docname}.rst").write_text(content, encoding="utf-8")
+
+    return write
+
+
+@pytest.fixture
+def build_documents(app: SphinxTestApp) -> Callable[[dict[str, str]], SphinxTestApp]:
+    """Write a multi-document project into ``app.srcdir`` and build it.
+
+    Meant for tests marked ``@pytest.mark.test_params(shared_result=...)``.
+    For these groups Sphinx hands out a ``SphinxTestAppWrapperForSkipBuilding``,
+    whose ``build()`` returns at once when the output directory already has
+    files; ``shared_result`` restores the first test's status and warning
+    streams. So only the first test of a group builds, and that skip is the
+    whole saving. Every test in a group must therefore pass the same
+    ``documents`` (a module-level mapping): later tests' sources are written
+    but never built. Each test then reads its own ``<docname>.html`` page.
+    """
+
+    def build(documents: dict[str, str]) -> SphinxTestApp:
+        toctree = "".join(f"   {docname}\n" for docname in documents)
+        sources = {"index": f"Index\n=====\n\n.. toctree::\n\n{toctree}", **documents}
+        for docname, content in sources.items():
+            app.srcdir.joinpath(f"{docname}.rst").write_text(content, encoding="utf-8")
+        app.build()
+        return app
+
+    return build
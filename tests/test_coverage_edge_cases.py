@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
+import os
 from unittest.mock import MagicMock
 
 import pytest
-from bs4 import BeautifulSoup
 from docutils import nodes
 from docutils.statemachine import StringList
 from docutils.utils import Reporter
@@ -13,10 +13,43 @@ from sphinx.testing.util import SphinxTestApp
 
 from filter_tabs import _depart_noop, _visit_skip_node
 from filter_tabs.assets import write_theme_css
+from filter_tabs.config import FilterTabsConfig, init_filter_tabs_config
 from filter_tabs.directives import TabDirective
 from filter_tabs.nodes import FilterTabSlotNode, FilterTabsNode
-from filter_tabs.transforms import process_filter_tabs_nodes, validate_tabs_structure
-from filter_tabs.utils import IDGenerator
+from filter_tabs.transforms import (
+    init_filter_tabs_registry,
+    merge_filter_tabs_docs,
+    process_filter_tabs_nodes,
+    purge_filter_tabs_doc,
+    validate_tabs_structure,
+)
+from filter_tabs.utils import IDGenerator, infer_content_type
+
+
+@pytest.fixture(scope="module")
+def tab_directive() -> TabDirective:
+    """A bare TabDirective; only its stateless argument parsing is exercised."""
+    return TabDirective("tab", ["name"], {}, StringList(), 1, 1, "", MagicMock(), MagicMock())
+
+
+@pytest.fixture(scope="module")
+def reporter() -> Reporter:
+    return Reporter("test", 1, 5)
+
+
+@pytest.fixture
+def doctree(reporter: Reporter) -> nodes.document:
+    return nodes.document({}, reporter)
+
+
+@pytest.fixture
+def html_app() -> MagicMock:
+    """A mock app building HTML, with "testdoc" registered as containing tabs."""
+    app = MagicMock()
+    app.builder.format = "html"
+    app.env.filter_tabs_docs = {"testdoc"}
+    init_filter_tabs_config(app, app.config)
+    return app
 
 
 def test_validate_tabs_structure_no_slots():
@@ -34,35 +67,56 @@ def test_validate_tabs_structure_missing_tab_name():
     assert validate_tabs_structure(ft_node) is False
 
 
-def test_id_generator_boundary():
-    """Test IDGenerator beyond reasonable index (if it were ever called)."""
-    id_gen = IDGenerator("test-group")
-    # Just to exercise the code even if it's defensively capped elsewhere
-    assert id_gen.radio_id(999) == "test-group-radio-999"
+@pytest.fixture(scope="module")
+def id_gen() -> IDGenerator:
+    return IDGenerator("test-group")
 
 
-@pytest.mark.sphinx("html")
-def test_invalid_node_removal_in_transform(app: SphinxTestApp):
-    """Test that an invalid FilterTabsNode is removed during transformation."""
-    # We'll manually insert an invalid node into the doctree
-    content = """
+@pytest.mark.parametrize(
+    ("method", "index", "expected"),
+    [
+        # Beyond any realistic index, even if it's defensively capped elsewhere.
+        ("radio_id", 999, "test-group-radio-999"),
+        ("panel_id", 0, "test-group-panel-0"),
+        ("desc_id", 2, "test-group-desc-2"),
+        ("label_id", 1, "test-group-label-1"),
+    ],
+)
+def test_id_generator_ids(id_gen, method, index, expected):
+    """Each IDGenerator method prefixes the index with the group id and role."""
+    assert getattr(id_gen, method)(index) == expected
+
+
+# Build-level edge cases share one project; each test reads its own page.
+EDGE_CASE_DOCS = {
+    "orphan_tab": """
 Test
 ====
 
 .. tab:: Orphan
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    # This will log an error about orphan tab, but we want to check
-    # if we can inject a FilterTabsNode that fails validation.
-    # Actually, it's easier to use a mock or a specific setup.
-    app.build()
+""",
+    "regular_admonition": """
+Test
+====
+.. admonition:: Regular
+
+   Content
+""",
+}
+
+
+@pytest.mark.sphinx("html")
+@pytest.mark.test_params(shared_result="edge-cases")
+def test_invalid_node_removal_in_transform(build_documents):
+    """A ``.. tab::`` outside ``.. filter-tabs::`` errors but does not stop the build."""
+    app = build_documents(EDGE_CASE_DOCS)
 
     # Check if build succeeded despite the error
-    assert (app.outdir / "index.html").exists()
+    assert (app.outdir / "orphan_tab.html").exists()
 
 
 @pytest.mark.sphinx("text")
-def test_assets_early_return_non_html(app: SphinxTestApp):
+def test_assets_early_return_non_html(app: SphinxTestApp, write_source):
     """Exercise early return in assets.py for non-HTML builders."""
     content = """
 Test
@@ -71,25 +125,34 @@ Test
    .. tab:: A
       Content
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
     app.build()
     assert (app.outdir / "index.txt").exists()
     # verify that theme file was NOT created
     assert not (app.outdir / "_static" / "filter_tabs_theme.css").exists()
 
 
-def test_id_generator_label_id():
-    """Test label_id method in IDGenerator."""
-    id_gen = IDGenerator("test")
-    assert id_gen.label_id(1) == "test-label-1"
+def test_infer_content_type_pattern_priority():
+    """Pattern order, not tab order, decides between competing matches."""
+    assert infer_content_type(["Linux", "Python"]) == "programming language"
+    # "go" (programming language) is found inside "cargos" before "cargo".
+    assert infer_content_type(["cargos"]) == "programming language"
+    # Overlapping keywords: "python" starts inside the "pip" match.
+    assert infer_content_type(["pipython"]) == "programming language"
 
 
-def test_tab_directive_empty_arg():
+def test_tab_directive_empty_arg(tab_directive):
     """Test _parse_tab_argument with empty string."""
-    mock_state_machine = MagicMock()
-    td = TabDirective("tab", ["name"], {}, StringList(), 1, 1, "", MagicMock(), mock_state_machine)
     with pytest.raises(ValueError, match="Tab argument cannot be empty"):
-        td._parse_tab_argument("")
+        tab_directive._parse_tab_argument("")
+
+
+def test_tab_directive_default_marker_variants(tab_directive):
+    """The default marker is recognised with inner spacing and any case."""
+    td = tab_directive
+    assert td._parse_tab_argument("Linux ( Default )") == ("Linux", True)
+    assert td._parse_tab_argument("Linux") == ("Linux", False)
+    assert td._parse_tab_argument("Defaults") == ("Defaults", False)
 
 
 def test_init_safety_net():
@@ -101,10 +164,9 @@ def test_init_safety_net():
     _depart_noop(None, nodes.Element())
 
 
-@pytest.mark.sphinx("html")
-def test_admonitions_disabled(app: SphinxTestApp):
+@pytest.mark.sphinx("html", confoverrides={"filter_tabs_enable_collapsible_admonitions": False})
+def test_admonitions_disabled(app: SphinxTestApp, write_source, parse_html):
     """Test collapsible admonitions when disabled via config."""
-    app.config.filter_tabs_enable_collapsible_admonitions = False
     content = """
 Test
 ====
@@ -113,31 +175,23 @@ Test
 
    Content
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
     app.build()
 
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    soup = parse_html(app.outdir / "index.html")
     # Should NOT have sft-fieldset or details
-    assert not soup.select(".sft-fieldset")
-    assert not soup.select("details")
+    assert not soup.find_all(class_="sft-fieldset")
+    assert not soup.find_all("details")
 
 
 @pytest.mark.sphinx("html")
-def test_admonition_without_collapsible_class(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="edge-cases")
+def test_admonition_without_collapsible_class(build_documents, parse_html):
     """Test that regular admonitions are not transformed."""
-    content = """
-Test
-====
-.. admonition:: Regular
-
-   Content
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    assert not soup.select("details")
-    assert soup.select_one(".admonition-regular")
+    app = build_documents(EDGE_CASE_DOCS)
+    soup = parse_html(app.outdir / "regular_admonition.html")
+    assert not soup.find_all("details")
+    assert soup.find(class_="admonition-regular")
 
 
 def test_write_theme_css_non_html():
@@ -157,18 +211,73 @@ def test_write_theme_css_exception():
     app.builder.format.assert_not_called()
 
 
-def test_process_filter_tabs_nodes_invalid():
-    """Directly exercise process_filter_tabs_nodes with invalid node."""
+def test_write_theme_css_unchanged_file_not_rewritten(tmp_path):
+    """An identical theme file is left alone on the next build."""
     app = MagicMock()
     app.builder.format = "html"
-    app.config = MagicMock()
-    doctree = nodes.document({}, Reporter("test", 1, 5))
+    app.config.filter_tabs_highlight_color = "#123456"
+    app.outdir = tmp_path
+    write_theme_css(app, None)
+    theme_file = tmp_path / "_static" / "filter_tabs_theme.css"
+    first_mtime = theme_file.stat().st_mtime_ns
+
+    os.utime(theme_file, ns=(first_mtime - 10**9, first_mtime - 10**9))
+    write_theme_css(app, None)
+    assert theme_file.stat().st_mtime_ns == first_mtime - 10**9
+
+    app.config.filter_tabs_highlight_color = "#654321"
+    write_theme_css(app, None)
+    assert "#654321" in theme_file.read_text(encoding="utf-8")
+
+
+def test_filter_tabs_config_read_once_per_app():
+    """config-inited reads the settings once; later lookups reuse them."""
+    app = MagicMock(spec=["config"])
+    app.config.filter_tabs_highlight_color = "#123456"
+    app.config.filter_tabs_debug_mode = True
+    init_filter_tabs_config(app, app.config)
+    config = FilterTabsConfig.for_app(app)
+    assert config == FilterTabsConfig(highlight_color="#123456", debug_mode=True)
+
+    app.config.filter_tabs_debug_mode = False
+    assert FilterTabsConfig.for_app(app) is config
+    with pytest.raises(AttributeError):
+        config.debug_mode = False  # type: ignore[misc]
+
+
+def test_process_filter_tabs_nodes_invalid(html_app, doctree):
+    """Directly exercise process_filter_tabs_nodes with invalid node."""
     parent = nodes.section()
     ft_node = FilterTabsNode()  # Invalid: no slots
     parent += ft_node
     doctree += parent
 
-    process_filter_tabs_nodes(app, doctree, "testdoc")
+    process_filter_tabs_nodes(html_app, doctree, "testdoc")
 
     # ft_node should have been removed from parent
     assert ft_node not in parent
+
+
+def test_process_filter_tabs_nodes_skips_builders_without_output(html_app, doctree):
+    """Builders with no output format (dummy, linkcheck, ...) leave the tree alone."""
+    html_app.builder.format = ""
+    ft_node = FilterTabsNode()
+    doctree += ft_node
+
+    process_filter_tabs_nodes(html_app, doctree, "testdoc")
+
+    assert ft_node in doctree
+
+
+def test_filter_tabs_registry_purge_and_merge():
+    """The per-document registry follows env-purge-doc and env-merge-info."""
+    env = MagicMock(spec=[])
+    init_filter_tabs_registry(MagicMock(), env, [])
+    env.filter_tabs_docs.update({"a", "b"})
+    purge_filter_tabs_doc(MagicMock(), env, "a")
+    assert env.filter_tabs_docs == {"b"}
+
+    other = MagicMock(spec=[])
+    other.filter_tabs_docs = {"c", "stale"}
+    merge_filter_tabs_docs(MagicMock(), env, {"c"}, other)
+    assert env.filter_tabs_docs == {"b", "c"}
@@ -1,18 +1,33 @@
 # tests/test_extension.py
 
 import importlib.util
+import re
+from collections import Counter
 
 import pytest
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import SoupStrainer
 from sphinx.testing.util import SphinxTestApp
 
 _rinoh_available = importlib.util.find_spec("rinoh") is not None
 
+# Most tests only look inside the tab widgets; parsing just those subtrees skips
+# the theme's navigation, sidebar and footer markup.
+TABS_ONLY = SoupStrainer(class_="sft-container")
+LEGEND_ONLY = SoupStrainer(class_="sft-legend")
+DETAILS_ONLY = SoupStrainer("details")
 
-@pytest.mark.sphinx("html")
-def test_basic_filter_tabs(app: SphinxTestApp):
-    """Test basic filter tabs functionality."""
-    content = """
+# Selectors used by several tests, compiled once.
+RADIOS = soupsieve.compile('.sft-radio-group input[type="radio"]')
+LABELS = soupsieve.compile(".sft-radio-group label")
+TAB_PANELS = soupsieve.compile('.sft-panel[role="tabpanel"]')
+GENERAL_PANEL = soupsieve.compile('.sft-panel[data-filter="General"]')
+
+
+# The markup-only accessibility tests share one build (see ``build_documents``
+# in conftest.py); each case is a separate document with its own HTML page.
+ACCESSIBILITY_DOCS = {
+    "basic": """
 Test Document
 =============
 
@@ -31,14 +46,259 @@ Test Document
     .. tab:: Rust
 
         Rust specific content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
+""",
+    "aria_label": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: CLI
+       :aria-label: Command Line Interface installation instructions
+
+        Install via command line.
+
+    .. tab:: GUI (default)
+       :aria-label: Graphical User Interface installation instructions
+
+        Install via graphical interface.
+""",
+    "accessibility": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: Python (default)
+        Python content
+    .. tab:: JavaScript
+        JS content
+""",
+}
+
+
+# Numbered tab directives for the many-tabs tests, built once; tab 0 is the default.
+_TABS_RST = [
+    f"    .. tab:: Tab {i}{' (default)' if i == 0 else ''}\n\n        Content {i}.\n"
+    for i in range(21)
+]
+
+
+_CSS_TAB_INDEX_RE = re.compile(r'data-tab-index="(\d+)"\]')
+
+
+def _theme_css_tab_indices(app: SphinxTestApp) -> set[int]:
+    """Return the tab indices that have a selector in the generated theme CSS."""
+    theme_css = (app.outdir / "_static" / "filter_tabs_theme.css").read_text()
+    return {int(index) for index in _CSS_TAB_INDEX_RE.findall(theme_css)}
+
+
+def _many_tabs_document(count: int) -> str:
+    return "\nTest Document\n=============\n\n.. filter-tabs::\n\n" + "\n".join(_TABS_RST[:count])
+
+
+TWELVE_TABS = _many_tabs_document(12)
+
+# Structural markup tests that need no special configuration also share a build.
+MARKUP_DOCS = {
+    "twelve_tabs": TWELVE_TABS,
+    "mixed_content": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    This paragraph is general content.
+
+    It can span multiple paragraphs.
+
+    .. note::
+
+        Even admonitions outside tabs are general.
+
+    .. tab:: Option A
+
+        Content for option A.
+
+    Some more general content between tabs.
+
+    .. tab:: Option B (default)
+
+        Content for option B.
+""",
+    "nested": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: Windows
+
+        Windows instructions:
+
+        .. filter-tabs::
+
+            .. tab:: Pip (default)
+                pip install package
+            .. tab:: Conda
+                conda install package
+
+    .. tab:: Mac (default)
+
+        Mac instructions here.
+""",
+    "multiple_groups": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: Python
+        Python 1
+    .. tab:: JavaScript
+        JS 1
+
+.. filter-tabs::
+
+    .. tab:: Python
+        Python 2
+    .. tab:: JavaScript
+        JS 2
+""",
+    "custom_legend": """
+Test Document
+=============
+
+.. filter-tabs::
+   :legend: My Custom Test Legend
+
+   .. tab:: One
+      Content One
+""",
+    "default_marker_case": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: Alpha (DEFAULT)
+
+        Alpha content.
+
+    .. tab:: Beta
+
+        Beta content.
+""",
+    "collapsible": """
+Test Document
+=============
+
+.. admonition:: My Title
+   :class: collapsible
+
+   Hidden content here.
+""",
+    "collapsible_expanded": """
+Test Document
+=============
+
+.. admonition:: Open Title
+   :class: collapsible expanded
+
+   Visible content here.
+""",
+}
+
+
+# Directive misuse cases share one build; each test only looks at the warnings
+# emitted for its own document.
+WARNING_DOCS = {
+    "default_marker_only": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: (default)
+
+        Content.
+""",
+    "orphan_tab": """
+Test Document
+=============
+
+.. tab:: Orphan
+
+    This tab has no parent filter-tabs directive.
+""",
+    "duplicate_name": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: Same
+
+        First.
+
+    .. tab:: Same
+
+        Second.
+""",
+    "empty_tab": """
+Test Document
+=============
+
+.. filter-tabs::
 
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    .. tab:: Empty
+
+    .. tab:: Full
+
+        Full content.
+""",
+    "multiple_defaults": """
+Test Document
+=============
+
+.. filter-tabs::
+
+    .. tab:: Alpha (default)
+
+        Alpha content.
+
+    .. tab:: Beta (default)
+
+        Beta content.
+""",
+}
+
+
+# The message each misuse document must produce. One alternation matches them
+# all in a single pass over the shared warning stream.
+EXPECTED_WARNINGS = {
+    "default_marker_only": "Invalid tab argument",
+    "orphan_tab": "`tab` can only be used inside a `filter-tabs`",
+    "duplicate_name": "Duplicate tab name 'Same'",
+    "empty_tab": "Tab 'Empty' has no content",
+    "multiple_defaults": "Multiple tabs marked as default",
+}
+_EXPECTED_WARNING_RE = re.compile(
+    r"(?P<docname>[\w-]+)\.rst:\d+: (?:WARNING|ERROR): (?P<message>"
+    + "|".join(map(re.escape, EXPECTED_WARNINGS.values()))
+    + ")"
+)
+
+
+@pytest.mark.sphinx("html")
+@pytest.mark.test_params(shared_result="accessibility")
+def test_basic_filter_tabs(build_documents, parse_html):
+    """Test basic filter tabs functionality."""
+    app = build_documents(ACCESSIBILITY_DOCS)
+    soup = parse_html(app.outdir / "basic.html", TABS_ONLY)
 
     # Check container structure
-    container = soup.select_one(".sft-container")
+    container = soup.find(class_="sft-container")
     assert container, "Container should exist"
     assert container.get("role") == "region", "Container should have region role"
 
@@ -47,17 +307,17 @@ Test Document
     assert fieldset, "Fieldset should have radiogroup role"
 
     # Check visible legend
-    legend = soup.select_one(".sft-legend")
+    legend = soup.find(class_="sft-legend")
     assert legend, "Legend should exist"
     legend_text = legend.get_text().strip()
     assert "Choose" in legend_text, "Legend should have meaningful text"
 
     # Check tabs were created
-    radios = soup.select('.sft-radio-group input[type="radio"]')
+    radios = RADIOS.select(soup)
     assert len(radios) == 3, f"Expected 3 tabs, found {len(radios)}"
 
     # Check tab names from labels
-    labels = soup.select(".sft-radio-group label")
+    labels = LABELS.select(soup)
     tab_names = [label.text.strip() for label in labels]
     assert tab_names == ["Python", "JavaScript", "Rust"]
 
@@ -65,85 +325,43 @@ Test Document
     assert radios[1].get("checked") is not None, "JavaScript tab should be default"
 
     # Check panels have proper roles
-    panels = soup.select('.sft-panel[role="tabpanel"]')
+    panels = TAB_PANELS.select(soup)
     assert len(panels) == 3, "Should have 3 panels with tabpanel role"
 
     # Check general content exists
-    general_panel = soup.select_one('.sft-panel[data-filter="General"]')
+    general_panel = GENERAL_PANEL.select_one(soup)
     assert general_panel, "General panel not found"
     assert "general content that appears" in general_panel.text
 
 
 @pytest.mark.sphinx("html")
-def test_aria_label_option(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="accessibility")
+def test_aria_label_option(build_documents, parse_html):
     """Test that the :aria-label: option adds proper ARIA attributes."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: CLI
-       :aria-label: Command Line Interface installation instructions
-
-        Install via command line.
-
-    .. tab:: GUI (default)
-       :aria-label: Graphical User Interface installation instructions
-
-        Install via graphical interface.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    app = build_documents(ACCESSIBILITY_DOCS)
+    soup = parse_html(app.outdir / "aria_label.html", TABS_ONLY)
 
     # Find the radio inputs
-    radios = soup.select('.sft-radio-group input[type="radio"]')
+    radios = RADIOS.select(soup)
 
     # Check that aria-labels were added
     assert radios[0].get("aria-label") == "Command Line Interface installation instructions"
     assert radios[1].get("aria-label") == "Graphical User Interface installation instructions"
 
     # Verify the visual labels are still short
-    labels = soup.select(".sft-radio-group label")
+    labels = LABELS.select(soup)
     assert labels[0].text.strip() == "CLI"
     assert labels[1].text.strip() == "GUI"
 
 
 @pytest.mark.sphinx("html")
-def test_mixed_general_and_tab_content(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_mixed_general_and_tab_content(build_documents, parse_html):
     """Test that content outside tab directives becomes general content."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    This paragraph is general content.
-
-    It can span multiple paragraphs.
-
-    .. note::
-
-        Even admonitions outside tabs are general.
-
-    .. tab:: Option A
-
-        Content for option A.
-
-    Some more general content between tabs.
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "mixed_content.html", TABS_ONLY)
 
-    .. tab:: Option B (default)
-
-        Content for option B.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-
-    general_panel = soup.select_one('.sft-panel[data-filter="General"]')
+    general_panel = GENERAL_PANEL.select_one(soup)
     assert general_panel, "General panel not found"
 
     general_text = general_panel.text
@@ -158,27 +376,15 @@ Test Document
 
 
 @pytest.mark.sphinx("html")
-def test_accessibility_features(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="accessibility")
+def test_accessibility_features(build_documents, parse_html):
     """Test accessibility features are properly implemented."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Python (default)
-        Python content
-    .. tab:: JavaScript
-        JS content
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    app = build_documents(ACCESSIBILITY_DOCS)
+    soup = parse_html(app.outdir / "accessibility.html", TABS_ONLY)
 
     # Check ARIA relationships
-    container = soup.select_one(".sft-container")
-    legend = soup.select_one(".sft-legend")
+    container = soup.find(class_="sft-container")
+    legend = soup.find(class_="sft-legend")
 
     # Container should reference legend
     assert container.get("aria-labelledby") == legend.get("id")
@@ -186,55 +392,35 @@ Test Document
     # --- START of updated section ---
 
     # Check that each radio button has a corresponding screen reader description
-    radios = soup.select('input[type="radio"]')
+    radios = soup.find_all("input", type="radio")
     assert len(radios) == 2
 
+    # One pass over the tree resolves every aria-describedby reference.
+    elements_by_id = {element["id"]: element for element in soup.find_all(id=True)}
     for radio in radios:
         describedby_id = radio.get("aria-describedby")
         assert describedby_id, "Radio button should have aria-describedby"
 
-        desc_element = soup.select_one(f"#{describedby_id}")
+        desc_element = elements_by_id.get(describedby_id)
         assert desc_element, f"Description element #{describedby_id} should exist"
         assert "sr-only" in desc_element.get("class", []), "Description should be sr-only"
 
     # Check panels are focusable (with typo corrected)
-    panels = soup.select('.sft-panel[role="tabpanel"]')
+    panels = TAB_PANELS.select(soup)
     for panel in panels:
         if panel.get("data-filter") != "General":  # General panel doesn't need tabindex
             assert panel.get("tabindex") == "0", "Panels should be focusable"
 
 
 @pytest.mark.sphinx("html")
-def test_nested_tabs(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_nested_tabs(build_documents, parse_html):
     """Test that nested tabs work correctly."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Windows
-
-        Windows instructions:
-
-        .. filter-tabs::
-
-            .. tab:: Pip (default)
-                pip install package
-            .. tab:: Conda
-                conda install package
-
-    .. tab:: Mac (default)
-
-        Mac instructions here.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "nested.html", TABS_ONLY)
 
     # Should have multiple filter-tabs containers
-    containers = soup.select(".sft-container")
+    containers = soup.find_all(class_="sft-container")
     assert len(containers) == 2, "Should have 2 nested containers"
 
     # Each should have their own radio groups
@@ -242,88 +428,46 @@ Test Document
     assert len(radiogroups) == 2, "Should have 2 radiogroups"
 
     # Check unique group names
-    radios = soup.select('input[type="radio"]')
+    radios = soup.find_all("input", type="radio")
     group_names = {radio.get("name") for radio in radios}
     assert len(group_names) == 2, "Should have 2 unique radio group names"
 
 
-FALLBACK_CONTENT = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    General content.
-
-    .. tab:: Python
-        Python content
-    .. tab:: JavaScript
-        JS content
-"""
-
-
 def _assert_fallback_output(text: str) -> None:
     """Assert that all tab and general content is present in the output."""
     assert "Python" in text, "Python tab should appear in output"
-    assert "JavaScript" in text, "JavaScript tab should appear in output"
-    assert "General content" in text, "General content should appear in output"
-
-
-@pytest.mark.sphinx("latex")
-def test_latex_fallback(app: SphinxTestApp):
-    """Test that LaTeX fallback behavior works."""
-    app.srcdir.joinpath("index.rst").write_text(FALLBACK_CONTENT)
-    app.build()
-
-    latex_files = list(app.outdir.glob("*.tex"))
-    assert len(latex_files) > 0, "Should generate at least one LaTeX file"
-    _assert_fallback_output(sorted(latex_files)[0].read_text())
-
-
-@pytest.mark.sphinx("text")
-def test_text_fallback(app: SphinxTestApp):
-    """Test that the plain-text builder renders all tab content."""
-    app.srcdir.joinpath("index.rst").write_text(FALLBACK_CONTENT)
-    app.build()
-
-    text_files = list(app.outdir.glob("*.txt"))
-    assert len(text_files) > 0, "Should generate at least one text file"
-    _assert_fallback_output(sorted(text_files)[0].read_text())
-
+    assert "JavaScript" in text, "JavaScript tab should appear in output"
+    assert "General content" in text, "General content should appear in output"
 
-@pytest.mark.sphinx(
-    "man", confoverrides={"man_pages": [("index", "testdoc", "Test", ["Author"], 1)]}
-)
-def test_man_fallback(app: SphinxTestApp):
-    """Test that the man page builder renders all tab content."""
-    app.srcdir.joinpath("index.rst").write_text(FALLBACK_CONTENT)
-    app.build()
 
-    man_files = list(app.outdir.glob("*.1"))
-    assert len(man_files) > 0, "Should generate at least one man page"
-    _assert_fallback_output(sorted(man_files)[0].read_text())
+# The fallback project (and its builder settings) lives in test-fallback/ at the
+# repository root. Sphinx copies it with its mtimes, so every builder after the
+# first reuses the pickled environment instead of reading the document again.
 
 
-@pytest.mark.sphinx(
-    "texinfo",
-    confoverrides={
-        "texinfo_documents": [
-            ("index", "testdoc", "Test", "Author", "testdoc", "A test.", "Miscellaneous")
-        ]
-    },
+@pytest.mark.parametrize(
+    ("buildername", "filename"),
+    [
+        ("latex", "testdoc.tex"),
+        ("text", "index.txt"),
+        ("man", "testdoc.1"),
+        ("texinfo", "testdoc.texi"),
+    ],
 )
-def test_texinfo_fallback(app: SphinxTestApp):
-    """Test that the Texinfo builder renders all tab content."""
-    app.srcdir.joinpath("index.rst").write_text(FALLBACK_CONTENT)
+@pytest.mark.sphinx(testroot="fallback", srcdir="fallback")
+def test_fallback_builders(app_params, make_app, buildername: str, filename: str):
+    """Each non-HTML builder renders all tab and general content."""
+    args, kwargs = app_params
+    app = make_app(buildername, **kwargs)
     app.build()
 
-    texi_files = list(app.outdir.glob("*.texi"))
-    assert len(texi_files) > 0, "Should generate at least one .texi file"
-    _assert_fallback_output(sorted(texi_files)[0].read_text())
+    output = app.outdir / filename
+    assert output.is_file(), f"{buildername} should generate {filename}"
+    _assert_fallback_output(output.read_text())
 
 
 @pytest.mark.skipif(not _rinoh_available, reason="rinohtype not installed")
-@pytest.mark.sphinx("rinoh")
+@pytest.mark.sphinx("rinoh", testroot="fallback", srcdir="fallback")
 def test_rinoh_smoke(app: SphinxTestApp):
     """Smoke test: rinoh builder completes without errors and produces a PDF.
 
@@ -331,17 +475,14 @@ def test_rinoh_smoke(app: SphinxTestApp):
     Content verification is not possible on binary PDF output without
     an additional extraction library.
     """
-    app.srcdir.joinpath("index.rst").write_text(FALLBACK_CONTENT)
     app.build()
     pdf_files = list(app.outdir.glob("*.pdf"))
     assert len(pdf_files) > 0, "rinoh builder should produce at least one PDF"
 
 
-@pytest.mark.sphinx("html")
-def test_configuration_theming(app: SphinxTestApp):
+@pytest.mark.sphinx("html", confoverrides={"filter_tabs_highlight_color": "#ff0000"})
+def test_configuration_theming(app: SphinxTestApp, write_source):
     """Test that the highlight colour config is written to the generated theme CSS file."""
-    app.config.filter_tabs_highlight_color = "#ff0000"
-
     content = """
 Test Document
 =============
@@ -351,14 +492,16 @@ Test Document
     .. tab:: Test
         Test content
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
     app.build()
 
     # The container element should no longer carry an inline style — the
     # colour is now injected globally via a generated filter_tabs_theme.css.
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    container = soup.select_one(".sft-container")
-    assert not container.get("style"), "Container should have no inline style attribute"
+    # Only the container's start tag matters, so no soup is needed.
+    html = (app.outdir / "index.html").read_text()
+    container_tag = re.search(r'<div\b[^>]*\bclass="sft-container"[^>]*>', html)
+    assert container_tag, "Container should exist"
+    assert "style=" not in container_tag.group(), "Container should have no inline style attribute"
 
     # Verify the generated theme CSS file exists and contains the configured value.
     theme_css_path = app.outdir / "_static" / "filter_tabs_theme.css"
@@ -370,44 +513,24 @@ Test Document
 
 
 @pytest.mark.sphinx("html")
-def test_unique_ids_multiple_groups(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_unique_ids_multiple_groups(build_documents, parse_html):
     """Test that IDs are unique across multiple tab groups."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Python
-        Python 1
-    .. tab:: JavaScript
-        JS 1
-
-.. filter-tabs::
-
-    .. tab:: Python
-        Python 2
-    .. tab:: JavaScript
-        JS 2
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "multiple_groups.html")
 
     # Collect all IDs
-    all_elements_with_ids = soup.select("[id]")
+    all_elements_with_ids = soup.find_all(id=True)
     all_ids = [elem.get("id") for elem in all_elements_with_ids]
 
     # Check for duplicates
-    duplicates = [id_val for id_val in set(all_ids) if all_ids.count(id_val) > 1]
+    duplicates = [id_val for id_val, count in Counter(all_ids).items() if count > 1]
     assert not duplicates, f"Duplicate IDs found: {duplicates}"
 
 
-@pytest.mark.sphinx("html")
-def test_default_tab_selection(app: SphinxTestApp):
+@pytest.mark.sphinx("html", confoverrides={"filter_tabs_debug_mode": True})
+def test_default_tab_selection(app: SphinxTestApp, write_source, parse_html):
     """Test that default tab selection works properly."""
-    app.config.filter_tabs_debug_mode = True
     content = """
 Test Document
 =============
@@ -423,37 +546,25 @@ Test Document
     .. tab:: Third
         Third tab content
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
     app.build()
 
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    soup = parse_html(app.outdir / "index.html", TABS_ONLY)
 
     # Check that the second radio button is checked
-    radios = soup.select('input[type="radio"]')
+    radios = soup.find_all("input", type="radio")
     assert len(radios) == 3
 
     # Find which radio has the checked attribute
-    checked_radios = []
-    for i, radio in enumerate(radios):
-        if radio.get("checked") is not None:
-            checked_radios.append(i)
-
-    # Debug output if the test fails
-    if checked_radios != [1]:
-        labels = soup.select(".sft-radio-group label")
-        label_texts = [label.text.strip() for label in labels]
-        print(f"Label texts: {label_texts}")
-        print(f"Checked radios: {checked_radios}")
-
-        # Check the tab data to see which one was marked as default
-        for i, radio in enumerate(radios):
-            print(f"Radio {i} checked: {radio.get('checked') is not None}")
-
-    assert checked_radios == [1], f"Expected second tab to be checked, but got: {checked_radios}"
+    checked_radios = [i for i, radio in enumerate(radios) if radio.get("checked") is not None]
+    assert checked_radios == [1], (
+        f"Expected second tab to be checked, but got: {checked_radios} "
+        f"(labels: {[label.text.strip() for label in LABELS.select(soup)]})"
+    )
 
 
 @pytest.mark.sphinx("html")
-def test_error_handling_no_tabs(app: SphinxTestApp):
+def test_error_handling_no_tabs(app: SphinxTestApp, write_source):
     """Test that filter-tabs without any tab directives logs an error."""
     content = """
 Test Document
@@ -463,7 +574,7 @@ Test Document
 
     This has no tab directives, should cause an error.
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
 
     # Run the build and expect Sphinx to log an error
     app.build()
@@ -474,52 +585,28 @@ Test Document
 
 
 @pytest.mark.sphinx("html")
-def test_custom_legend_option(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_custom_legend_option(build_documents, parse_html):
     """Test that the :legend: option provides a custom legend."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-   :legend: My Custom Test Legend
-
-   .. tab:: One
-      Content One
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "custom_legend.html")
 
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-
-    legend = soup.select_one(".sft-legend")
+    legend = soup.find(class_="sft-legend")
     assert legend, "Legend should exist"
     assert legend.get_text().strip() == "My Custom Test Legend"
 
 
 @pytest.mark.sphinx("html")
-def test_more_than_ten_tabs(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_more_than_ten_tabs(build_documents, parse_html):
     """Test that tab groups with more than 10 tabs work correctly.
 
     Previously the CSS selector block was static and capped at 10. Now it is
     generated dynamically, so all tabs must appear in the HTML and the
     generated theme CSS must contain a selector for every index.
     """
-    tabs = "\n".join(
-        f"    .. tab:: Tab {i}{' (default)' if i == 0 else ''}\n\n        Content {i}.\n"
-        for i in range(12)
-    )
-    content = f"""
-Test Document
-=============
-
-.. filter-tabs::
-
-{tabs}
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "twelve_tabs.html", TABS_ONLY)
 
     # All 12 panels must be present in the DOM.
     panels = soup.select(".sft-panel[data-tab-index]")
@@ -529,15 +616,13 @@ Test Document
     )
 
     # The generated theme CSS must contain a selector for every index 0–11.
-    theme_css = (app.outdir / "_static" / "filter_tabs_theme.css").read_text()
-    for i in range(12):
-        assert f'data-tab-index="{i}"]' in theme_css, (
-            f"Expected selector for data-tab-index={i} in generated theme CSS"
-        )
+    missing = set(range(12)) - _theme_css_tab_indices(app)
+    assert not missing, f"Expected selectors for data-tab-index={sorted(missing)}"
 
 
 @pytest.mark.sphinx("html")
-def test_nested_tab_selector_isolation(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_nested_tab_selector_isolation(build_documents):
     """Test that the generated CSS uses the child combinator to isolate nested groups.
 
     The selector must use '> .sft-panel' (child combinator) not ' .sft-panel'
@@ -545,30 +630,9 @@ def test_nested_tab_selector_isolation(app: SphinxTestApp):
     group would also force-show panel index N inside any nested group,
     overriding the inner group's own radio state.
     """
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Outer A (default)
-
-        .. filter-tabs::
-
-            .. tab:: Inner X (default)
-
-                Inner X content.
-
-            .. tab:: Inner Y
-
-                Inner Y content.
-
-    .. tab:: Outer B
-
-        Outer B content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
+    # The theme CSS is written once per build; the "nested" document supplies
+    # the nested groups.
+    app = build_documents(MARKUP_DOCS)
 
     theme_css = (app.outdir / "_static" / "filter_tabs_theme.css").read_text()
 
@@ -584,151 +648,84 @@ Test Document
     )
 
 
-# =============================================================================
-# _parse_tab_argument edge cases
-# =============================================================================
-
-
-@pytest.mark.sphinx("html")
-def test_tab_name_case_insensitive_default(app: SphinxTestApp):
-    """'(DEFAULT)' in any case is recognised as the default marker."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Alpha (DEFAULT)
-
-        Alpha content.
+# The two-document project for these tests lives in test-multi-doc/.
 
-    .. tab:: Beta
 
-        Beta content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
+@pytest.mark.sphinx("html", testroot="multi-doc", srcdir="multi-doc-html")
+def test_tabs_in_second_document(app: SphinxTestApp, parse_html):
+    """Only documents containing filter-tabs are recorded; they still render."""
     app.build()
 
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    radios = soup.select('input[type="radio"]')
-    assert radios[0].get("checked") is not None, "Alpha should be default (case-insensitive)"
-    assert radios[1].get("checked") is None
-
-
-@pytest.mark.sphinx("html")
-def test_tab_name_with_only_default_marker_is_error(app: SphinxTestApp):
-    """A tab whose name would be empty after stripping '(default)' must error."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
+    assert app.env.filter_tabs_docs == {"other"}
+    soup = parse_html(app.outdir / "other.html", TABS_ONLY)
+    assert len(RADIOS.select(soup)) == 2
 
-    .. tab:: (default)
 
-        Content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
+@pytest.mark.sphinx("singlehtml", testroot="multi-doc", srcdir="multi-doc-singlehtml")
+def test_singlehtml_renders_tabs_from_included_document(app: SphinxTestApp, parse_html):
+    """Assembled builders resolve under the root docname, so they must not be skipped."""
     app.build()
 
-    warnings = app._warning.getvalue()
-    assert "Invalid tab argument" in warnings
-
-
-@pytest.mark.sphinx("html")
-def test_tab_outside_filter_tabs_errors(app: SphinxTestApp):
-    """A ``.. tab::`` directive used outside ``.. filter-tabs::`` must produce an error."""
-    content = """
-Test Document
-=============
+    soup = parse_html(app.outdir / "index.html", TABS_ONLY)
+    assert len(RADIOS.select(soup)) == 2
 
-.. tab:: Orphan
 
-    This tab has no parent filter-tabs directive.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
+@pytest.mark.sphinx("pdflike", testroot="multi-doc", srcdir="multi-doc-pdflike")
+def test_renamed_singlehtml_subclass_renders_tabs_from_included_document(
+    app: SphinxTestApp, parse_html
+):
+    """Single-page builders registered under another name (e.g. PDF-via-HTML) are not skipped."""
     app.build()
 
-    warnings = app._warning.getvalue()
-    assert "tab` can only be used inside a `filter-tabs`" in warnings
+    soup = parse_html(app.outdir / "index.html", TABS_ONLY)
+    assert len(RADIOS.select(soup)) == 2
 
 
 # =============================================================================
-# _validate_slots warnings
+# _parse_tab_argument edge cases
 # =============================================================================
 
 
 @pytest.mark.sphinx("html")
-def test_duplicate_tab_name_errors(app: SphinxTestApp):
-    """Duplicate tab names inside one filter-tabs block must produce an error."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Same
-
-        First.
-
-    .. tab:: Same
-
-        Second.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    warnings = app._warning.getvalue()
-    assert "Duplicate tab name 'Same'" in warnings
+@pytest.mark.test_params(shared_result="markup")
+def test_tab_name_case_insensitive_default(build_documents, parse_html):
+    """'(DEFAULT)' in any case is recognised as the default marker."""
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "default_marker_case.html", TABS_ONLY)
+    radios = soup.find_all("input", type="radio")
+    assert radios[0].get("checked") is not None, "Alpha should be default (case-insensitive)"
+    assert radios[1].get("checked") is None
 
 
 @pytest.mark.sphinx("html")
-def test_empty_tab_content_warns(app: SphinxTestApp):
-    """A tab with no body content should log a warning."""
-    content = """
-Test Document
-=============
+@pytest.mark.test_params(shared_result="warnings")
+def test_directive_misuse_warnings(build_documents):
+    """Each misuse document reports its own error or warning, and no other."""
+    app = build_documents(WARNING_DOCS)
+    found = {
+        (m["docname"], m["message"]) for m in _EXPECTED_WARNING_RE.finditer(app._warning.getvalue())
+    }
+    assert found == set(EXPECTED_WARNINGS.items())
 
-.. filter-tabs::
-
-    .. tab:: Empty
-
-    .. tab:: Full
-
-        Full content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
 
+@pytest.mark.sphinx("html")
+@pytest.mark.test_params(shared_result="warnings")
+def test_tab_warnings_point_at_the_tab(build_documents):
+    """Tab warnings report the offending tab's line, not the filter-tabs line."""
+    app = build_documents(WARNING_DOCS)
     warnings = app._warning.getvalue()
-    assert "Tab 'Empty' has no content" in warnings
+    assert "empty_tab.rst:7: WARNING: Tab 'Empty' has no content" in warnings
+    # The second default is the one being ignored.
+    assert "multiple_defaults.rst:11: WARNING: Multiple tabs marked as default" in warnings
 
 
 @pytest.mark.sphinx("html")
-def test_multiple_defaults_uses_first_and_warns(app: SphinxTestApp):
-    """Multiple '(default)' markers should warn and use the first one."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Alpha (default)
-
-        Alpha content.
-
-    .. tab:: Beta (default)
-
-        Beta content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    warnings = app._warning.getvalue()
-    assert "Multiple tabs marked as default" in warnings
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    radios = soup.select('input[type="radio"]')
+@pytest.mark.test_params(shared_result="warnings")
+def test_multiple_defaults_uses_first(build_documents, parse_html):
+    """Multiple '(default)' markers select the first one (the warning is checked above)."""
+    app = build_documents(WARNING_DOCS)
+    soup = parse_html(app.outdir / "multiple_defaults.html", TABS_ONLY)
+    radios = soup.find_all("input", type="radio")
     assert radios[0].get("checked") is not None, "First tab should be default"
     assert radios[1].get("checked") is None
 
@@ -738,110 +735,36 @@ Test Document
 # =============================================================================
 
 
-@pytest.mark.sphinx("html")
-def test_legend_infers_programming_language(app: SphinxTestApp):
-    """Tab names matching programming languages produce a 'programming language' legend."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Python
-
-        Python content.
-
-    .. tab:: JavaScript
-
-        JS content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    legend_text = soup.select_one(".sft-legend").get_text()
-    assert "programming language" in legend_text
-
-
-@pytest.mark.sphinx("html")
-def test_legend_infers_via_substring(app: SphinxTestApp):
-    """Tab names that contain a keyword (not an exact match) still infer the type."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: CPython
-
-        CPython content.
-
-    .. tab:: PyPy
+def _tabs_document(tab_names: list[str]) -> str:
+    tabs = "".join(f"    .. tab:: {name}\n\n        {name} content.\n\n" for name in tab_names)
+    return f"\nTest Document\n=============\n\n.. filter-tabs::\n\n{tabs}"
 
-        PyPy content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
 
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    legend_text = soup.select_one(".sft-legend").get_text()
-    # "cpython" contains "python" → programming language
-    assert "programming language" in legend_text
+# Legend inference cases: document name -> (tab names, expected content type).
+LEGEND_CASES = {
+    "exact_keywords": (["Python", "JavaScript"], "programming language"),
+    # "cpython" contains "python" but is not an exact match.
+    "substring_keyword": (["CPython", "PyPy"], "programming language"),
+    # "conda-forge" fails the exact pass and matches "conda" as a substring.
+    "substring_only": (["conda-forge"], "package manager"),
+    "unrecognised": (["Foo", "Bar"], "option"),
+}
+LEGEND_DOCS = {docname: _tabs_document(names) for docname, (names, _) in LEGEND_CASES.items()}
 
 
 @pytest.mark.sphinx("html")
-def test_substring_matching_order(app: SphinxTestApp):
-    """Exact match should take precedence over substring match.
+@pytest.mark.test_params(shared_result="legends")
+@pytest.mark.parametrize("docname", list(LEGEND_CASES))
+def test_legend_infers_content_type(build_documents, parse_html, docname):
+    """The default legend names the content type inferred from the tab names.
 
-    'conda-forge' will NOT match 'conda' exact match (pass 1).
-    But if 'conda' exact match happens first, 'conda-forge' shouldn't magically match.
-    The real issue was `"source"` exact vs `"environment" (open source)` substring.
-    Let's test 'conda-forge' which matches 'package manager' substring.
+    Exact keyword matches are tried before substring matches, and names that
+    match nothing fall back to 'option'.
     """
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: conda-forge
-
-        conda-forge content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    legend_text = soup.select_one(".sft-legend").get_text()
-
-    # "conda-forge" is not an exact match for "conda", but matches as a substring.
-    # Therefore, it will fall through Pass 1 and hit Pass 2 for "package manager"
-    assert "package manager" in legend_text
-
-
-@pytest.mark.sphinx("html")
-def test_legend_falls_back_to_option(app: SphinxTestApp):
-    """Unrecognised tab names fall back to 'option' in the legend."""
-    content = """
-Test Document
-=============
-
-.. filter-tabs::
-
-    .. tab:: Foo
-
-        Foo content.
-
-    .. tab:: Bar
-
-        Bar content.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    legend_text = soup.select_one(".sft-legend").get_text()
-    assert "option" in legend_text
+    app = build_documents(LEGEND_DOCS)
+    soup = parse_html(app.outdir / f"{docname}.html", LEGEND_ONLY)
+    expected = LEGEND_CASES[docname][1]
+    assert f"Choose {expected}:" in soup.find(class_="sft-legend").get_text()
 
 
 # =============================================================================
@@ -850,26 +773,16 @@ Test Document
 
 
 @pytest.mark.sphinx("html")
-def test_collapsible_admonition_collapsed(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_collapsible_admonition_collapsed(build_documents, parse_html):
     """An admonition with the 'collapsible' class renders as a <details> element."""
-    content = """
-Test Document
-=============
-
-.. admonition:: My Title
-   :class: collapsible
-
-   Hidden content here.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    details = soup.select_one("details.collapsible-section")
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "collapsible.html", DETAILS_ONLY)
+    details = soup.find("details", class_="collapsible-section")
     assert details is not None, "<details> element not found"
     assert details.get("open") is None, "Collapsed details should not have 'open' attribute"
 
-    summary = details.select_one("summary")
+    summary = details.find("summary")
     assert summary is not None
     assert "My Title" in summary.get_text()
 
@@ -877,28 +790,18 @@ Test Document
 
 
 @pytest.mark.sphinx("html")
-def test_collapsible_admonition_expanded(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="markup")
+def test_collapsible_admonition_expanded(build_documents, parse_html):
     """An admonition with both 'collapsible' and 'expanded' classes renders open."""
-    content = """
-Test Document
-=============
-
-.. admonition:: Open Title
-   :class: collapsible expanded
-
-   Visible content here.
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    soup = BeautifulSoup((app.outdir / "index.html").read_text(), "html.parser")
-    details = soup.select_one("details.collapsible-section")
+    app = build_documents(MARKUP_DOCS)
+    soup = parse_html(app.outdir / "collapsible_expanded.html", DETAILS_ONLY)
+    details = soup.find("details", class_="collapsible-section")
     assert details is not None
     assert details.get("open") == "open", "Expanded details should have open='open'"
 
 
 @pytest.mark.sphinx("html")
-def test_collapsible_admonition_no_title_uses_details(app: SphinxTestApp):
+def test_collapsible_admonition_no_title_uses_details(app: SphinxTestApp, write_source):
     """A collapsible admonition with no explicit title falls back to 'Details'."""
     content = """
 Test Document
@@ -909,7 +812,7 @@ Test Document
 
    Content without a title.
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
     # This may error during RST parsing (admonition requires a title argument),
     # but if it builds, the summary should fall back to "Details".
     app.build()
@@ -918,7 +821,7 @@ Test Document
 
 
 @pytest.mark.sphinx("latex")
-def test_collapsible_admonition_ignored_on_latex(app: SphinxTestApp):
+def test_collapsible_admonition_ignored_on_latex(app: SphinxTestApp, write_source):
     """Collapsible admonitions are left as plain admonitions on non-HTML builders."""
     content = """
 Test Document
@@ -929,12 +832,13 @@ Test Document
 
    Collapsible content.
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
     app.build()
 
-    latex_files = list(app.outdir.glob("*.tex"))
-    assert latex_files, "LaTeX output should be produced"
-    latex_text = sorted(latex_files)[0].read_text()
+    # The target file name comes from latex_documents (derived from the project name).
+    latex_file = app.outdir / app.config.latex_documents[0][1]
+    assert latex_file.is_file(), "LaTeX output should be produced"
+    latex_text = latex_file.read_text()
     # Content must still appear; it must NOT be wrapped in <details>
     assert "Collapsible content" in latex_text
     assert "<details" not in latex_text
@@ -946,57 +850,28 @@ Test Document
 
 
 @pytest.mark.sphinx("html")
-def test_theme_css_warn_threshold(app: SphinxTestApp):
+def test_theme_css_warn_threshold(app: SphinxTestApp, write_source):
     """16 tabs (> WARN_THRESHOLD=15) should log a warning, but 20 tabs are generated anyway."""
-    n = 16
-    tabs = "\n".join(
-        f"    .. tab:: Tab{i}{' (default)' if i == 0 else ''}\n\n        Content {i}.\n"
-        for i in range(n)
-    )
-    content = f"""
-Test Document
-=============
-
-.. filter-tabs::
-
-{tabs}
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(_many_tabs_document(16))
     app.build()
 
     warnings = app._warning.getvalue()
     assert "hard to navigate" in warnings
 
-    theme_css = (app.outdir / "_static" / "filter_tabs_theme.css").read_text()
-    for i in range(20):
-        assert f'data-tab-index="{i}"]' in theme_css
+    assert _theme_css_tab_indices(app) >= set(range(20))
 
 
 @pytest.mark.sphinx("html")
-def test_theme_css_hard_cap(app: SphinxTestApp):
+def test_theme_css_hard_cap(app: SphinxTestApp, write_source):
     """21 tabs (> HARD_CAP=20) should log an error and cap selectors at index 19."""
-    n = 21
-    tabs = "\n".join(
-        f"    .. tab:: Tab{i}{' (default)' if i == 0 else ''}\n\n        Content {i}.\n"
-        for i in range(n)
-    )
-    content = f"""
-Test Document
-=============
-
-.. filter-tabs::
-
-{tabs}
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(_many_tabs_document(21))
     app.build()
 
     warnings = app._warning.getvalue()
     assert "capped at 20" in warnings
 
-    theme_css = (app.outdir / "_static" / "filter_tabs_theme.css").read_text()
+    indices = _theme_css_tab_indices(app)
     # Selectors for indices 0–19 must be present
-    for i in range(20):
-        assert f'data-tab-index="{i}"]' in theme_css
+    assert indices >= set(range(20))
     # Index 20 must NOT have a selector (capped)
-    assert 'data-tab-index="20"]' not in theme_css
+    assert 20 not in indices
